@@ -3,6 +3,7 @@ import pickle
 import pandas as pd
 import numpy as np
 import shap
+from conformal_intervals import load_interval_table, predict_with_intervals
 
 # --- Page Config ---
 st.set_page_config(page_title="Car Price Predictor", page_icon="🚀", layout="wide")
@@ -136,9 +137,15 @@ def load_data(data_path):
     except FileNotFoundError:
         return None
 
+@st.cache_resource
+def load_intervals(table_path):
+    """Loads the precomputed conformal interval table (None if not calibrated yet)."""
+    return load_interval_table(table_path)
+
 # Load resources
 pipeline, preprocessor, explainer = load_model_and_explainer('src/car_price_predictor.pkl')
 df = load_data(r'src/cars24_cleaned.csv')
+interval_table = load_intervals('src/prediction_intervals.json')
 
 # --- App UI ---
 st.title('🚀 Car Price Prediction Tool')
@@ -193,6 +200,16 @@ if submitted:
     })
     
     predicted_price = pipeline.predict(input_data)[0]
+
+    # Calibrated range from the precomputed residual table (one lookup, no extra model calls)
+    interval_html = ""
+    if interval_table is not None:
+        interval = predict_with_intervals(pipeline, interval_table, input_data, [predicted_price]).iloc[0]
+        coverage = 1 - interval_table['alpha']
+        interval_html = f"""
+            <p style="font-size:1.1rem; color:white; margin:0.5rem 0 0 0;">
+                {coverage:.0%} range: ₹ {interval['lower']:.2f} – {interval['upper']:.2f} Lakhs
+            </p>"""
     
     # --- Display Results ---
     st.markdown("---")
@@ -221,7 +238,7 @@ if submitted:
             <p style="font-size:2.5rem; font-weight:700; color:white; 
                       text-shadow:1px 1px 2px rgba(0,0,0,0.3); margin:0;">
                 ₹ {predicted_price:.2f} Lakhs
-            </p>
+            </p>{interval_html}
         </div>
         """,
         unsafe_allow_html=True
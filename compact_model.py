@@ -0,0 +1,186 @@
+import argparse
+import copy
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+import shap
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from schema import FEATURE_COLUMNS, TARGET_COLUMN
+
+
+# --- Model introspection ---
+def is_xgboost(model):
+    return hasattr(model, 'get_booster')
+
+
+def tree_count(model):
+    if is_xgboost(model):
+        return model.get_booster().num_boosted_rounds()
+    return len(np.ravel(model.estimators_))
+
+
+def leaf_count(model):
+    if is_xgboost(model):
+        trees = model.get_booster().trees_to_dataframe()
+        return int((trees['Feature'] == 'Leaf').sum())
+    return int(sum(tree.tree_.n_leaves for tree in np.ravel(model.estimators_)))
+
+
+def check_supported(model):
+    if not (is_xgboost(model) or hasattr(model, 'estimators_')):
+        raise ValueError(f"Unsupported regressor {type(model).__name__}: expected XGBoost or a fitted sklearn tree ensemble.")
+
+
+# --- Variants ---
+def prune_trees(model, n_trees):
+    """Keeps the first n_trees trees (boosting rounds) of the ensemble."""
+    if is_xgboost(model):
+        pruned = model.get_booster()[:n_trees]
+        variant = type(model)()
+        variant.load_model(bytearray(pruned.save_raw('ubj')))
+        return variant
+    variant = copy.deepcopy(model)
+    variant.estimators_ = variant.estimators_[:n_trees]
+    variant.n_estimators = n_trees
+    if hasattr(variant, 'n_estimators_'):
+        variant.n_estimators_ = n_trees
+    if hasattr(variant, 'train_score_'):
+        variant.train_score_ = variant.train_score_[:n_trees]
+    return variant
+
+
+def distill(model, X_train, teacher_predictions, n_trees, max_depth, learning_rate=None, random_state=42):
+    """Fits a smaller ensemble of the same family to the teacher's predictions."""
+    student = clone(model).set_params(n_estimators=n_trees, max_depth=max_depth)
+    params = student.get_params()
+    if learning_rate is not None and 'learning_rate' in params:
+        student.set_params(learning_rate=learning_rate)
+    if 'random_state' in params:
+        student.set_params(random_state=random_state)
+    return student.fit(X_train, teacher_predictions)
+
+
+# --- Measurements ---
+def _median_ms(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def evaluate(name, preprocessor, model, X_test, y_test, baseline_mae, repeats):
+    """Size, single-row and SHAP latency, and holdout MAE of one serving pipeline."""
+    pipeline = Pipeline([('preprocessor', preprocessor), ('regressor', model)])
+    row = X_test.iloc[[0]]
+    row_transformed = preprocessor.transform(row)
+    if hasattr(row_transformed, 'toarray'):
+        # TreeExplainer only accepts sparse input for XGBoost; a dense row works for every family
+        row_transformed = row_transformed.toarray()
+
+    start = time.perf_counter()
+    explainer = shap.TreeExplainer(model)
+    explainer_ms = (time.perf_counter() - start) * 1000
+
+    mae = mean_absolute_error(y_test, pipeline.predict(X_test))
+    return {
+        'variant': name,
+        'trees': tree_count(model),
+        'leaves': leaf_count(model),
+        'pipeline_kb': round(len(pickle.dumps(pipeline)) / 1024, 1),
+        'regressor_kb': round(len(pickle.dumps(model)) / 1024, 1),
+        'predict_ms': round(_median_ms(lambda: pipeline.predict(row), repeats), 3),
+        'explainer_init_ms': round(explainer_ms, 1),
+        'shap_ms': round(_median_ms(lambda: explainer.shap_values(row_transformed), repeats), 3),
+        'mae': round(float(mae), 4),
+        'mae_delta': round(float(mae - baseline_mae), 4) if baseline_mae is not None else 0.0,
+    }, pipeline
+
+
+def build_variants(model, X_train, prune_fractions, distill_configs, learning_rate):
+    """Yields (name, model) for every requested compact variant."""
+    n_trees = tree_count(model)
+    for fraction in prune_fractions:
+        keep = max(1, int(round(n_trees * fraction)))
+        if keep < n_trees:
+            yield f"prune-{keep}", prune_trees(model, keep)
+
+    teacher_predictions = model.predict(X_train)
+    for trees, depth in distill_configs:
+        yield f"distill-{trees}x{depth}", distill(model, X_train, teacher_predictions, trees, depth, learning_rate)
+
+
+def parse_distill(text):
+    configs = []
+    for part in filter(None, text.split(',')):
+        trees, _, depth = part.partition('x')
+        try:
+            configs.append((int(trees), int(depth)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected TREESxDEPTH, got '{part}'")
+    return configs
+
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Build compact variants of the car price regressor and compare them.")
+    parser.add_argument('--model', default='src/car_price_predictor.pkl')
+    parser.add_argument('--data', default='src/cars24_cleaned.csv')
+    parser.add_argument('--prune', default='0.25,0.5',
+                        help="Fractions of the trees to keep, comma-separated.")
+    parser.add_argument('--distill', type=parse_distill, default=parse_distill('100x4,50x3'),
+                        help="Student ensembles as TREESxDEPTH, comma-separated.")
+    parser.add_argument('--learning-rate', type=float, default=None,
+                        help="Learning rate for boosted students (default: the teacher's).")
+    parser.add_argument('--holdout-size', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=50, help="Timing repeats per measurement.")
+    parser.add_argument('--save-dir', help="Write each variant as a full pipeline pickle here.")
+    parser.add_argument('--json', help="Also write the report to this file.")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as file:
+        pipeline = pickle.load(file)
+    preprocessor = pipeline.named_steps['preprocessor']
+    model = pipeline.named_steps['regressor']
+    check_supported(model)
+
+    df = pd.read_csv(args.data)
+    train_df, test_df = train_test_split(df, test_size=args.holdout_size, random_state=args.seed)
+    X_train = preprocessor.transform(train_df[FEATURE_COLUMNS])
+    X_test, y_test = test_df[FEATURE_COLUMNS], test_df[TARGET_COLUMN]
+
+    baseline, _ = evaluate('baseline', preprocessor, model, X_test, y_test, None, args.repeats)
+    rows = [baseline]
+    prune_fractions = [float(value) for value in args.prune.split(',') if value]
+    for name, variant in build_variants(model, X_train, prune_fractions, args.distill, args.learning_rate):
+        row, variant_pipeline = evaluate(name, preprocessor, variant, X_test, y_test, baseline['mae'], args.repeats)
+        rows.append(row)
+        if args.save_dir:
+            os.makedirs(args.save_dir, exist_ok=True)
+            with open(os.path.join(args.save_dir, f"car_price_predictor_{name}.pkl"), 'wb') as file:
+                pickle.dump(variant_pipeline, file)
+
+    report = pd.DataFrame(rows).set_index('variant')
+    print(report.to_string())
+    if is_xgboost(model):
+        print("XGBoost already stores split thresholds and leaf values as float32, so no separate float32 variant is built.")
+    else:
+        print("scikit-learn trees keep float64 node arrays, so a float32 variant would not reduce their size.")
+    print("Note: the holdout split is seeded, not the original training split, so MAE may be optimistic for all variants.")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(rows, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from ingest_listings import read_store
+from schema import FEATURE_COLUMNS, TARGET_COLUMN
+
+# Band edges are left-closed: [0, 3) years, [3, 6) years, ...
+AGE_BAND_EDGES = [0, 3, 6, 10, np.inf]
+AGE_BAND_LABELS = ['0-2', '3-5', '6-9', '10+']
+PRICE_BAND_EDGES = [0, 3, 5, 8, 12, 20, np.inf]
+PRICE_BAND_LABELS = ['<3', '3-5', '5-8', '8-12', '12-20', '20+']
+
+ANY = '*'
+
+
+# --- Segmenting ---
+def _band(values, edges, labels):
+    """Maps numeric values to band labels (values below the first edge go to the first band)."""
+    idx = np.searchsorted(edges, np.asarray(values, dtype=float), side='right') - 1
+    idx = np.clip(idx, 0, len(labels) - 1)
+    return np.asarray(labels, dtype=object)[idx]
+
+
+def age_band(car_age):
+    return _band(car_age, AGE_BAND_EDGES, AGE_BAND_LABELS)
+
+
+def price_band(predicted_price):
+    return _band(predicted_price, PRICE_BAND_EDGES, PRICE_BAND_LABELS)
+
+
+def segment_keys(brands, ages, predictions):
+    """Builds the Brand|age|price keys and their *|*|price fallbacks."""
+    age_bands = age_band(ages)
+    price_bands = price_band(predictions)
+    brands = np.asarray(brands, dtype=object).astype(str)
+    full = [f"{b}|{a}|{p}" for b, a, p in zip(brands, age_bands, price_bands)]
+    by_price = [f"{ANY}|{ANY}|{p}" for p in price_bands]
+    return full, by_price
+
+
+# --- Calibration ---
+def conformal_quantile(residuals, alpha):
+    """Split-conformal quantile: the ceil((n + 1)(1 - alpha))-th smallest absolute residual.
+
+    Infinite when that rank exceeds n, i.e. there are too few residuals for 1 - alpha coverage.
+    """
+    residuals = np.sort(np.asarray(residuals, dtype=float))
+    n = len(residuals)
+    rank = int(np.ceil((n + 1) * (1 - alpha)))
+    if rank > n:
+        return np.inf
+    return float(residuals[rank - 1])
+
+
+def _row_keys(df):
+    """Content hash of each row that does not depend on whether values were read as numbers or strings."""
+    normalized = pd.DataFrame({
+        column: df[column].astype('float64') if pd.api.types.is_numeric_dtype(df[column]) else df[column].astype(str)
+        for column in df.columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def drop_training_rows(df, training_df):
+    """Removes rows the model was trained on; their residuals are in-sample and would understate the intervals."""
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    seen = _row_keys(training_df[columns])
+    in_training = _row_keys(df[columns]).isin(seen).to_numpy()
+    return df.loc[~in_training], int(in_training.sum())
+
+
+def calibrate(pipeline, df, alpha=0.1, min_count=30, holdout_size=0.4, random_state=42):
+    """Computes per-segment residual quantiles on a calibration split and reports holdout coverage.
+
+    df must hold listings the model was not trained on, otherwise the residuals are
+    in-sample and both the intervals and the reported coverage are optimistic.
+    """
+    calib_df, holdout_df = train_test_split(df, test_size=holdout_size, random_state=random_state)
+
+    preds = pipeline.predict(calib_df[FEATURE_COLUMNS])
+    residuals = np.abs(calib_df[TARGET_COLUMN].to_numpy() - preds)
+    full, by_price = segment_keys(calib_df['Brand'], calib_df['Car Age'], preds)
+
+    quantiles, counts = {}, {}
+    frame = pd.DataFrame({'full': full, 'by_price': by_price, 'residual': residuals})
+    for level in ('full', 'by_price'):
+        for key, group in frame.groupby(level)['residual']:
+            # Segments too small for a finite bound at this alpha fall through to the next key
+            quantile = conformal_quantile(group, alpha)
+            if len(group) >= min_count and np.isfinite(quantile):
+                quantiles[key] = round(quantile, 4)
+                counts[key] = int(len(group))
+    global_key = f"{ANY}|{ANY}|{ANY}"
+    quantile = conformal_quantile(residuals, alpha)
+    if not np.isfinite(quantile):
+        raise ValueError(f"{len(residuals)} calibration rows are too few for alpha={alpha}; "
+                         f"at least {int(np.ceil(1 / alpha)) - 1} are needed.")
+    quantiles[global_key] = round(quantile, 4)
+    counts[global_key] = int(len(residuals))
+
+    table = {
+        'alpha': alpha,
+        'min_count': min_count,
+        'quantiles': quantiles,
+        'counts': counts,
+    }
+    table['holdout'] = coverage_report(pipeline, table, holdout_df)
+    return table
+
+
+def coverage_report(pipeline, table, df):
+    """Empirical coverage and mean width of the intervals on labelled rows."""
+    result = predict_with_intervals(pipeline, table, df[FEATURE_COLUMNS])
+    actual = df[TARGET_COLUMN].to_numpy()
+    covered = (actual >= result['lower'].to_numpy()) & (actual <= result['upper'].to_numpy())
+    width = (result['upper'] - result['lower']).to_numpy()
+
+    bands = price_band(result['prediction'])
+    per_band = {}
+    for label in PRICE_BAND_LABELS:
+        mask = bands == label
+        if mask.any():
+            per_band[label] = {
+                'rows': int(mask.sum()),
+                'coverage': round(float(covered[mask].mean()), 4),
+                'mean_width': round(float(width[mask].mean()), 4),
+            }
+    return {
+        'rows': int(len(df)),
+        'target_coverage': round(1 - table['alpha'], 4),
+        'coverage': round(float(covered.mean()), 4),
+        'mean_width': round(float(width.mean()), 4),
+        'by_price_band': per_band,
+    }
+
+
+# --- Serving ---
+def load_interval_table(table_path):
+    """Loads a calibrated interval table, or None if it has not been generated."""
+    try:
+        with open(table_path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def predict_with_intervals(pipeline, table, input_data, predictions=None):
+    """Predicts prices for a frame of listings and attaches calibrated lower/upper bounds."""
+    if predictions is None:
+        predictions = pipeline.predict(input_data)
+    predictions = np.asarray(predictions, dtype=float)
+    full, by_price = segment_keys(input_data['Brand'], input_data['Car Age'], predictions)
+
+    quantiles = table['quantiles']
+    fallback = quantiles[f"{ANY}|{ANY}|{ANY}"]
+    half_width = np.array([
+        quantiles.get(f, quantiles.get(p, fallback)) for f, p in zip(full, by_price)
+    ])
+    return pd.DataFrame({
+        'prediction': predictions,
+        'lower': np.maximum(predictions - half_width, 0.0),
+        'upper': predictions + half_width,
+    }, index=input_data.index)
+
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate conformal prediction intervals for the car price model.")
+    parser.add_argument('--model', default='src/car_price_predictor.pkl')
+    parser.add_argument('--data', default='src/listings_store',
+                        help="Labelled listings the model has not seen: an ingest_listings.py store or a CSV file.")
+    parser.add_argument('--training-data', default='src/cars24_cleaned.csv',
+                        help="The model's training data; matching rows are dropped from --data.")
+    parser.add_argument('--output', default='src/prediction_intervals.json')
+    parser.add_argument('--alpha', type=float, default=0.1, help="Miscoverage rate (0.1 -> 90%% intervals).")
+    parser.add_argument('--min-count', type=int, default=30, help="Minimum calibration rows per segment.")
+    parser.add_argument('--holdout-size', type=float, default=0.4)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as file:
+        pipeline = pickle.load(file)
+    df = read_store(args.data) if os.path.isdir(args.data) else pd.read_csv(args.data)
+    if os.path.exists(args.training_data):
+        df, in_training = drop_training_rows(df, pd.read_csv(args.training_data))
+        print(f"Dropped {in_training} rows that are in the training data ({args.training_data}).")
+    else:
+        print(f"Warning: {args.training_data} not found, so rows the model was trained on cannot be excluded; "
+              "coverage may be optimistic.")
+    if df.empty:
+        parser.error(f"no calibration rows left in {args.data}; pass listings the model was not trained on "
+                     "(e.g. a store built with ingest_listings.py)")
+
+    try:
+        table = calibrate(pipeline, df, alpha=args.alpha, min_count=args.min_count,
+                          holdout_size=args.holdout_size, random_state=args.seed)
+    except ValueError as exc:
+        parser.error(str(exc))
+    with open(args.output, 'w') as file:
+        json.dump(table, file, separators=(',', ':'))
+
+    report = table['holdout']
+    print(f"Calibration rows: {len(df)}  segments: {len(table['quantiles'])} -> {args.output}")
+    print(f"Holdout rows: {report['rows']}  target coverage: {report['target_coverage']:.0%}  "
+          f"coverage: {report['coverage']:.1%}  mean width: {report['mean_width']:.2f} Lakhs")
+    for label, stats in report['by_price_band'].items():
+        print(f"  {label:>6} Lakhs  rows={stats['rows']:5d}  coverage={stats['coverage']:.1%}  "
+              f"width={stats['mean_width']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
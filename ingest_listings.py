@@ -0,0 +1,270 @@
+import argparse
+import glob
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from schema import TARGET_COLUMN
+
+# --- Schema ---
+# Raw scrape columns (as listed on the Home page) and the clean layout of cars24_cleaned.csv
+RAW_COLUMNS = [
+    'Car Model', 'Year', 'KM Driven', 'Fuel Type', 'Transmission Type',
+    'Ownership', TARGET_COLUMN
+]
+CLEAN_COLUMNS = [
+    'KM Driven', 'Fuel Type', 'Transmission Type', 'Ownership',
+    TARGET_COLUMN, 'Brand', 'Model_Only', 'Car Age'
+]
+CLEAN_DTYPES = {
+    'KM Driven': 'int64',
+    'Fuel Type': 'string',
+    'Transmission Type': 'string',
+    'Ownership': 'int64',
+    TARGET_COLUMN: 'float64',
+    'Brand': 'string',
+    'Model_Only': 'string',
+    'Car Age': 'int64',
+}
+
+# Same bounds as the Prediction form inputs
+KM_RANGE = (0, 500000)
+OWNERSHIP_RANGE = (1, 10)
+MIN_YEAR = 2000
+REFERENCE_YEAR = 2025
+
+HASHES_FILE = '_seen_hashes.npy'
+REPORT_FILE = '_quality.jsonl'
+PENDING_SUFFIX = '.pending'
+
+NUMERIC_RAW_COLUMNS = ['Year', 'KM Driven', 'Ownership', TARGET_COLUMN]
+INTEGER_RAW_COLUMNS = ['Year', 'KM Driven', 'Ownership']
+# Thousands separators, whitespace and unit/currency tokens; signs and exponents are kept
+NUMBER_NOISE = r'(?i)[,\s]|₹|(?<![a-z])(?:rs\.?|inr|lakhs?|lacs?|kms?|kilometers?)(?![a-z])'
+
+
+# --- Vectorized cleaning ---
+def _per_unique(series, func):
+    """Applies a vectorized transform to the distinct values only and broadcasts the result back."""
+    codes, uniques = pd.factorize(series)
+    result = func(pd.Series(uniques, dtype='string'))
+    # reindex (not iloc) so the NA code -1 maps to NA, including when every value is null
+    return result.reindex(codes).set_axis(series.index)
+
+
+def _parse_number(series):
+    """Parses numbers that may carry units or separators (e.g. '60,660 km', 'Rs. 3.57')."""
+    cleaned = series.str.replace(NUMBER_NOISE, '', regex=True)
+    parsed = pd.to_numeric(cleaned, errors='coerce')
+    return pd.Series(parsed.to_numpy(dtype='float64', na_value=np.nan))
+
+
+def _to_number(series):
+    return _per_unique(series, _parse_number)
+
+
+def clean_chunk(raw, reference_year=REFERENCE_YEAR):
+    """Cleans one chunk of raw listings; returns the clean frame and per-reason drop counts."""
+    # Listings repeat a few hundred model names, so split the distinct names only
+    brand = _per_unique(raw['Car Model'], lambda names: names.str.strip().str.split(' ', n=1).str[0])
+    model_only = _per_unique(raw['Car Model'], lambda names: names.str.strip().str.split(' ', n=1).str[1].str.strip())
+    numbers = {column: _to_number(raw[column]) for column in NUMERIC_RAW_COLUMNS}
+    year = numbers['Year']
+
+    df = pd.DataFrame({
+        'KM Driven': numbers['KM Driven'],
+        'Fuel Type': raw['Fuel Type'].astype('string').str.strip(),
+        'Transmission Type': raw['Transmission Type'].astype('string').str.strip(),
+        'Ownership': numbers['Ownership'],
+        TARGET_COLUMN: numbers[TARGET_COLUMN],
+        'Brand': brand,
+        'Model_Only': model_only,
+        'Car Age': reference_year - year,
+    })
+
+    # A value that is present but does not parse is a parse failure, not a missing field
+    unparseable = np.zeros(len(df), dtype=bool)
+    for column, parsed in numbers.items():
+        present = raw[column].astype('string').str.strip().fillna('') != ''
+        unparseable |= (present & parsed.isna()).to_numpy()
+    values = np.column_stack([numbers[column].to_numpy() for column in NUMERIC_RAW_COLUMNS])
+    # Integer fields must be whole numbers; the final cast would silently truncate them
+    integers = np.column_stack([numbers[column].to_numpy() for column in INTEGER_RAW_COLUMNS])
+
+    checks = {
+        'unparseable': unparseable,
+        'missing_fields': df.isna().any(axis=1).to_numpy(),
+        'not_finite': ~np.isfinite(values).all(axis=1),
+        'not_whole_number': (integers != np.floor(integers)).any(axis=1),
+        'km_out_of_range': ~df['KM Driven'].between(*KM_RANGE).to_numpy(),
+        'ownership_out_of_range': ~df['Ownership'].between(*OWNERSHIP_RANGE).to_numpy(),
+        'year_out_of_range': ~year.between(MIN_YEAR, reference_year).to_numpy(),
+        'price_not_positive': ~(df[TARGET_COLUMN] > 0).to_numpy(),
+    }
+    # Attribute each dropped row to the first failing check only
+    dropped = np.zeros(len(df), dtype=bool)
+    drop_counts = {}
+    for reason, failed in checks.items():
+        failed = failed & ~dropped
+        drop_counts[reason] = int(failed.sum())
+        dropped |= failed
+
+    df = df.loc[~dropped].astype(CLEAN_DTYPES)
+    return df[CLEAN_COLUMNS].reset_index(drop=True), drop_counts
+
+
+def row_hashes(df):
+    """64-bit content hash of each clean row, used for deduplication."""
+    return pd.util.hash_pandas_object(df[CLEAN_COLUMNS], index=False).to_numpy()
+
+
+def _contains_sorted(seen, hashes):
+    """Membership test against the sorted array of already-stored hashes."""
+    if not len(seen):
+        return np.zeros(len(hashes), dtype=bool)
+    idx = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+    return seen[idx] == hashes
+
+
+def _merge_sorted(seen, new_hashes):
+    """Inserts new hashes into the sorted array without re-sorting what is already there."""
+    new_hashes = np.sort(new_hashes)
+    return np.insert(seen, np.searchsorted(seen, new_hashes), new_hashes)
+
+
+# --- Store ---
+def load_seen_hashes(store_dir):
+    try:
+        return np.load(os.path.join(store_dir, HASHES_FILE))
+    except FileNotFoundError:
+        return np.empty(0, dtype=np.uint64)
+
+
+def save_seen_hashes(store_dir, seen):
+    """Atomically replaces the hash file so a crash never leaves it half-written."""
+    path = os.path.join(store_dir, HASHES_FILE)
+    with open(path + PENDING_SUFFIX, 'wb') as file:
+        np.save(file, seen)
+    os.replace(path + PENDING_SUFFIX, path)
+
+
+def recover_pending(store_dir, seen):
+    """Resolves partitions left pending by an interrupted run.
+
+    A pending partition is only published once its hashes are saved, so if all
+    of its hashes are recorded the run died just before publishing it and it is
+    promoted; otherwise its hashes were never saved and the rows will be
+    ingested again, so it is discarded.
+    """
+    for pending in glob.glob(os.path.join(store_dir, f'part-*.csv{PENDING_SUFFIX}')):
+        rows = pd.read_csv(pending, dtype=CLEAN_DTYPES)
+        if _contains_sorted(seen, row_hashes(rows)).all():
+            publish_partition(pending[:-len(PENDING_SUFFIX)])
+        else:
+            os.remove(pending)
+
+
+def publish_partition(partition):
+    """Renames a pending partition into place, refusing to overwrite a published one."""
+    # The overwritten rows' hashes are already recorded, so replacing a partition would lose them for good
+    if os.path.exists(partition):
+        raise FileExistsError(f"Partition {partition} already exists; leaving {partition + PENDING_SUFFIX} in place.")
+    os.replace(partition + PENDING_SUFFIX, partition)
+
+
+def read_store(store_dir):
+    """Reads all appended partitions back into one typed frame."""
+    paths = sorted(glob.glob(os.path.join(store_dir, 'part-*.csv')))
+    if not paths:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in CLEAN_DTYPES.items()})
+    return pd.concat(
+        [pd.read_csv(path, dtype=CLEAN_DTYPES) for path in paths], ignore_index=True
+    )
+
+
+# --- Ingestion ---
+def ingest(paths, store_dir, chunksize=500000, reference_year=REFERENCE_YEAR):
+    """Streams raw listing files in chunks into appended partitions; yields one quality report per batch."""
+    os.makedirs(store_dir, exist_ok=True)
+    seen = load_seen_hashes(store_dir)
+    recover_pending(store_dir, seen)
+    # Timestamp first so partitions sort by run; the random suffix keeps runs in the same second apart
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    batch = 0
+
+    for path in paths:
+        reader = pd.read_csv(path, usecols=RAW_COLUMNS, dtype='string', chunksize=chunksize)
+        start = time.perf_counter()
+        for raw in reader:
+            clean, drop_counts = clean_chunk(raw, reference_year)
+
+            hashes = row_hashes(clean)
+            dup_in_batch = pd.Series(hashes).duplicated().to_numpy()
+            dup_seen = _contains_sorted(seen, hashes) & ~dup_in_batch
+            keep = ~(dup_in_batch | dup_seen)
+            clean = clean.loc[keep]
+            seen = _merge_sorted(seen, hashes[keep])
+
+            # Write the partition under a pending name, record its hashes, then publish it,
+            # so a crash at any point leaves the store and the hash file consistent
+            partition = None
+            if len(clean):
+                partition = os.path.join(store_dir, f"part-{run_id}-{batch:05d}.csv")
+                clean.to_csv(partition + PENDING_SUFFIX, index=False)
+            save_seen_hashes(store_dir, seen)
+            if partition:
+                publish_partition(partition)
+            elapsed = time.perf_counter() - start
+
+            report = {
+                'batch': batch,
+                'source': path,
+                'partition': partition,
+                'rows_in': int(len(raw)),
+                'dropped': drop_counts,
+                'duplicates_in_batch': int(dup_in_batch.sum()),
+                'duplicates_seen': int(dup_seen.sum()),
+                'rows_out': int(len(clean)),
+                'seconds': round(elapsed, 4),
+                'rows_per_minute': int(len(raw) / elapsed * 60) if elapsed else None,
+            }
+            with open(os.path.join(store_dir, REPORT_FILE), 'a') as file:
+                file.write(json.dumps(report) + '\n')
+            batch += 1
+            yield report
+            start = time.perf_counter()
+
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Stream raw car listing files into the cleaned dataset store.")
+    parser.add_argument('paths', nargs='+', help="Raw listing CSV files.")
+    parser.add_argument('--store', default='src/listings_store', help="Directory of appended partitions.")
+    parser.add_argument('--chunksize', type=int, default=500000)
+    parser.add_argument('--reference-year', type=int, default=REFERENCE_YEAR,
+                        help="Year used to derive Car Age.")
+    args = parser.parse_args()
+
+    total_in = total_out = 0
+    total_seconds = 0.0
+    for report in ingest(args.paths, args.store, args.chunksize, args.reference_year):
+        total_in += report['rows_in']
+        total_out += report['rows_out']
+        total_seconds += report['seconds']
+        dropped = sum(report['dropped'].values())
+        duplicates = report['duplicates_in_batch'] + report['duplicates_seen']
+        print(f"batch {report['batch']:5d}  in={report['rows_in']:8d}  dropped={dropped:7d}  "
+              f"dupes={duplicates:7d}  out={report['rows_out']:8d}  "
+              f"{report['rows_per_minute'] or 0:,} rows/min")
+
+    if total_seconds:
+        print(f"Ingested {total_out:,} of {total_in:,} rows into {args.store} "
+              f"({total_in / total_seconds * 60:,.0f} rows/min)")
+
+
+if __name__ == '__main__':
+    main()
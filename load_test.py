@@ -0,0 +1,501 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter, defaultdict
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+ACTIONS = ('predict', 'dropdown', 'eda')
+# Widgets inside st.form keep their value in the browser until submit, so these never reach the server
+CLIENT_SIDE_ACTIONS = ('dropdown',)
+EDA_VIEWS = ['Single Feature Analysis', 'Two-Feature Relationship', 'Correlation Insights']
+WIDGET_TYPES = ('selectbox', 'number_input', 'button', 'radio')
+
+# One server hosts both pages, the same way a multipage deployment does
+ENTRY_TEMPLATE = """import sys
+import streamlit as st
+
+sys.path[:0] = {page_dirs!r}
+st.navigation([
+    st.Page({prediction_page!r}, title='Prediction'),
+    st.Page({eda_page!r}, title='EDA'),
+]).run()
+"""
+
+
+# --- Measurements ---
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux /proc)."""
+    with open(f'/proc/{pid}/statm') as file:
+        pages = int(file.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+class MemorySampler(threading.Thread):
+    """Samples the server's RSS in the background so short peaks between actions are not missed."""
+
+    def __init__(self, pid, interval=0.1):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.after_load = None
+        self._stop_event = threading.Event()
+
+    def mark_loaded(self):
+        """Records RSS once a user's pages are loaded; the last call is the warm baseline."""
+        self.after_load = rss_mb(self.pid)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.samples.append(rss_mb(self.pid))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.samples.append(rss_mb(self.pid))
+
+
+class CacheCounter:
+    """Counts st.cache_data / st.cache_resource hits and misses per cached function.
+
+    Runs inside the server process. Streamlit has no public hit/miss counters,
+    so this wraps the internal CachedFunc handlers and periodically writes the
+    totals to a JSON file for the load generator to read; if the handlers are
+    missing in the installed version the report says so instead of failing.
+    """
+
+    def __init__(self, stats_path, interval=0.5):
+        self.stats_path = stats_path
+        self.interval = interval
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    def install(self):
+        try:
+            from streamlit.runtime.caching.cache_utils import CachedFunc
+        except ImportError:
+            return False
+        if not all(hasattr(CachedFunc, name) for name in ('_handle_cache_hit', '_handle_cache_miss')):
+            return False
+
+        counter = self
+        original_hit = CachedFunc._handle_cache_hit
+        original_miss = CachedFunc._handle_cache_miss
+
+        def handle_hit(func_self, *args, **kwargs):
+            counter._count(counter.hits, func_self)
+            return original_hit(func_self, *args, **kwargs)
+
+        def handle_miss(func_self, *args, **kwargs):
+            counter._count(counter.misses, func_self)
+            return original_miss(func_self, *args, **kwargs)
+
+        CachedFunc._handle_cache_hit = handle_hit
+        CachedFunc._handle_cache_miss = handle_miss
+        threading.Thread(target=self._dump_forever, daemon=True).start()
+        return True
+
+    def _count(self, counter, func_self):
+        name = getattr(func_self._info.func, '__qualname__', repr(func_self))
+        with self._lock:
+            counter[name] += 1
+
+    def _dump_forever(self):
+        while True:
+            with self._lock:
+                stats = {'hits': dict(self.hits), 'misses': dict(self.misses)}
+            with open(self.stats_path + '.tmp', 'w') as file:
+                json.dump(stats, file)
+            os.replace(self.stats_path + '.tmp', self.stats_path)
+            time.sleep(self.interval)
+
+
+def read_cache_stats(stats_path):
+    try:
+        with open(stats_path) as file:
+            stats = json.load(file)
+    except FileNotFoundError:
+        return None
+    return Counter(stats['hits']), Counter(stats['misses'])
+
+
+def cache_report(before, after):
+    """Hit/miss counts per cached function between two snapshots."""
+    if before is None or after is None:
+        return None
+    hits, misses = after[0] - before[0], after[1] - before[1]
+    result = {}
+    for name in sorted(set(hits) | set(misses)):
+        result[name] = {
+            'hits': hits[name],
+            'misses': misses[name],
+            'hit_ratio': round(hits[name] / (hits[name] + misses[name]), 4),
+        }
+    return result
+
+
+# --- Server ---
+def serve(entry, port, stats_path):
+    """Runs `streamlit run` in this process with the cache counters installed."""
+    CacheCounter(stats_path).install()
+    from streamlit.web import cli
+    sys.argv = [
+        'streamlit', 'run', entry,
+        '--server.port', str(port),
+        '--server.address', '127.0.0.1',
+        '--server.headless', 'true',
+        '--server.fileWatcherType', 'none',
+        '--browser.gatherUsageStats', 'false',
+    ]
+    sys.exit(cli.main())
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(prediction_page, eda_page, port, workdir, timeout):
+    """Starts the app as a `streamlit run` subprocess and waits for its health check."""
+    prediction_page, eda_page = os.path.abspath(prediction_page), os.path.abspath(eda_page)
+    entry = os.path.join(workdir, 'load_test_app.py')
+    with open(entry, 'w') as file:
+        file.write(ENTRY_TEMPLATE.format(
+            page_dirs=sorted({os.path.dirname(prediction_page), os.path.dirname(eda_page)}),
+            prediction_page=prediction_page,
+            eda_page=eda_page,
+        ))
+    stats_path = os.path.join(workdir, 'cache_stats.json')
+    log = open(os.path.join(workdir, 'server.log'), 'w')
+    # The pages read 'src/...' paths, so the server keeps this working directory
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', entry, '--port', str(port),
+         '--cache-stats', stats_path],
+        stdout=log, stderr=subprocess.STDOUT,
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited early; see {log.name}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return process, stats_path
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Streamlit server did not become healthy within {timeout}s; see {log.name}")
+
+
+# --- Browser session ---
+class PageSession:
+    """One browser tab: a websocket session that reruns the script with widget states.
+
+    Speaks Streamlit's BackMsg/ForwardMsg protobuf protocol on /_stcore/stream
+    directly, which is an internal interface and may need updating with Streamlit.
+    """
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.websocket = None
+        self.widgets = {}
+        self.values = {}
+        self.triggers = []
+        self.pages = {}
+        self.page_hash = ''
+
+    async def open(self):
+        self.websocket = await connect(self.url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        await self.websocket.close()
+
+    def set_value(self, label, value):
+        kind, widget = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        if kind == 'number_input':
+            state.double_value = value
+        else:
+            state.string_value = value
+        self.values[widget.id] = state
+
+    def options(self, label):
+        return list(self.widgets[label][1].options)
+
+    def click(self, label):
+        self.triggers.append(WidgetState(id=self.widgets[label][1].id, trigger_value=True))
+
+    async def rerun(self):
+        """Sends one rerun request and waits for the script to finish; returns error messages."""
+        message = BackMsg()
+        message.rerun_script.page_script_hash = self.page_hash
+        message.rerun_script.widget_states.widgets.extend(list(self.values.values()) + self.triggers)
+        self.triggers = []
+        await self.websocket.send(message.SerializeToString())
+        return await asyncio.wait_for(self._read_until_finished(), self.timeout)
+
+    async def _read_until_finished(self):
+        self.widgets, errors = {}, []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof('type')
+            if kind == 'navigation':
+                self.pages = {page.page_name: page.page_script_hash for page in message.navigation.app_pages}
+            elif kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = (element_type, widget)
+                elif element_type == 'exception':
+                    errors.append(element.exception.message)
+            elif kind == 'page_not_found':
+                errors.append(f"page not found: {message.page_not_found.page_name}")
+            elif kind == 'script_finished':
+                return errors
+
+
+# --- Simulated user ---
+class SimulatedUser:
+    """One user with a tab open on each page."""
+
+    def __init__(self, url, timeout, seed):
+        self.rng = random.Random(seed)
+        self.prediction = PageSession(url, timeout)
+        self.eda = PageSession(url, timeout)
+
+    async def load(self):
+        await self.prediction.open()
+        await self.eda.open()
+        errors = await self.prediction.rerun()
+        self.eda.page_hash = self.prediction.pages['EDA']
+        return errors + await self.eda.rerun()
+
+    async def close(self):
+        await self.prediction.close()
+        await self.eda.close()
+
+    async def predict(self):
+        tab = self.prediction
+        tab.set_value('Manufacturing Year', self.rng.randint(2005, 2024))
+        tab.set_value('Kilometers Driven', self.rng.randrange(0, 200000, 1000))
+        tab.set_value('Model', self.rng.choice(tab.options('Model')))
+        tab.click('Predict Price')
+        return await tab.rerun()
+
+    def dropdown(self):
+        """Picks a Brand in the prediction form; it is sent with the next Predict submit."""
+        tab = self.prediction
+        tab.set_value('Brand', self.rng.choice(tab.options('Brand')))
+
+    async def eda_view(self):
+        tab = self.eda
+        tab.set_value('Choose Analysis Type', self.rng.choice(EDA_VIEWS))
+        errors = await tab.rerun()
+        for label, (kind, _) in list(tab.widgets.items()):
+            if kind == 'selectbox':
+                tab.set_value(label, self.rng.choice(tab.options(label)))
+        return errors + await tab.rerun()
+
+
+async def run_user(user, mix, actions, think_time, results, memory):
+    """Plays one user's session and records (action, seconds, error messages) tuples.
+
+    Client-side actions are recorded with seconds=None since they cost the server nothing.
+    """
+    handlers = {'predict': user.predict, 'dropdown': user.dropdown, 'eda': user.eda_view}
+    plan = ['load'] + user.rng.choices(list(mix), weights=list(mix.values()), k=actions)
+    try:
+        for action in plan:
+            if action in CLIENT_SIDE_ACTIONS:
+                handlers[action]()
+                results.append((action, None, []))
+            else:
+                start = time.perf_counter()
+                try:
+                    errors = await (user.load() if action == 'load' else handlers[action]())
+                except Exception as exc:
+                    errors = [f"{type(exc).__name__}: {exc}"]
+                results.append((action, time.perf_counter() - start, errors))
+            if action == 'load':
+                memory.mark_loaded()
+            if think_time:
+                await asyncio.sleep(user.rng.uniform(0, 2 * think_time))
+    finally:
+        await user.close()
+
+
+async def run_level(url, users, args, memory):
+    simulated = [SimulatedUser(url, args.timeout, args.seed + i) for i in range(users)]
+    results = []
+    await asyncio.gather(*[
+        run_user(user, args.mix, args.actions, args.think_time, results, memory) for user in simulated
+    ])
+    return results
+
+
+# --- Reporting ---
+def summarize(results, wall_seconds, memory, cache, users):
+    by_action = defaultdict(list)
+    errors = Counter()
+    messages = Counter()
+    client_side = Counter()
+    for action, elapsed, action_errors in results:
+        if elapsed is None:
+            client_side[action] += 1
+            continue
+        by_action[action].append(elapsed * 1000)
+        errors[action] += len(action_errors)
+        messages.update(action_errors)
+
+    latency = {}
+    for action in ('load',) + ACTIONS:
+        if action not in by_action:
+            continue
+        values = np.asarray(by_action[action])
+        latency[action] = {
+            'count': int(len(values)),
+            'errors': int(errors[action]),
+            'p50_ms': round(float(np.percentile(values, 50)), 1),
+            'p90_ms': round(float(np.percentile(values, 90)), 1),
+            'p99_ms': round(float(np.percentile(values, 99)), 1),
+            'max_ms': round(float(values.max()), 1),
+        }
+    completed = sum(len(values) for action, values in by_action.items() if action != 'load')
+    after_load = memory.after_load if memory.after_load is not None else memory.samples[0]
+    return {
+        'users': users,
+        'sessions': 2 * users,
+        'wall_seconds': round(wall_seconds, 2),
+        'throughput_actions_per_s': round(completed / wall_seconds, 2) if wall_seconds else None,
+        'latency': latency,
+        'client_side_actions': dict(client_side),
+        'server_memory_mb': {
+            'start': round(memory.samples[0], 1),
+            'after_load': round(after_load, 1),
+            'peak': round(max(memory.samples), 1),
+            'end': round(memory.samples[-1], 1),
+            'growth_after_load': round(memory.samples[-1] - after_load, 1),
+        },
+        'cache': cache,
+        'top_errors': [{'message': message, 'count': count} for message, count in messages.most_common(5)],
+    }
+
+
+def print_report(report):
+    print(f"Users: {report['users']} ({report['sessions']} sessions)  wall time: {report['wall_seconds']}s  "
+          f"throughput: {report['throughput_actions_per_s']} actions/s")
+    print(f"{'action':<10}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action, stats in report['latency'].items():
+        print(f"{action:<10}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10}"
+              f"{stats['p90_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    for action, count in report['client_side_actions'].items():
+        print(f"{action:<10}{count:>7}  client-side only (sent with the next form submit, no server rerun)")
+    memory = report['server_memory_mb']
+    print(f"Server RSS MB: start={memory['start']}  after load={memory['after_load']}  peak={memory['peak']}  "
+          f"end={memory['end']}  growth after load={memory['growth_after_load']}")
+    for error in report['top_errors']:
+        print(f"error x{error['count']}: {error['message'][:160]}")
+    if report['cache'] is None:
+        print("Cache hit/miss counters are not available for this Streamlit version.")
+    else:
+        for name, stats in report['cache'].items():
+            print(f"cache {name:<32} hits={stats['hits']:<6} misses={stats['misses']:<4} "
+                  f"hit ratio={stats['hit_ratio']:.1%}")
+    print()
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown action '{name}' (choose from {', '.join(ACTIONS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def parse_levels(text):
+    try:
+        return [int(value) for value in text.split(',') if value]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated user counts, got '{text}'")
+
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test both Streamlit pages through a local `streamlit run` server with concurrent sessions.")
+    parser.add_argument('--users', type=parse_levels, default=parse_levels('5,10,20'),
+                        help="Concurrent user counts to run one after another, comma-separated.")
+    parser.add_argument('--actions', type=int, default=20, help="Actions per user after the initial page load.")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('predict=0.5,dropdown=0.3,eda=0.2'),
+                        help="Relative weights of predict, dropdown (client-side Brand change) and eda actions.")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean pause between actions, in seconds.")
+    parser.add_argument('--prediction-page', default='src/2_Prediction.py')
+    parser.add_argument('--eda-page', default='src/1_EDA.py')
+    parser.add_argument('--port', type=int, default=0, help="Server port (default: a free port).")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per-rerun and server start timeout, in seconds.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the reports to this file.")
+    # Internal: how the load generator starts the server subprocess
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-stats', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.cache_stats)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='load_test_')
+    port = args.port or free_port()
+    process, stats_path = start_server(args.prediction_page, args.eda_page, port, workdir, args.timeout)
+    url = f'ws://127.0.0.1:{port}/_stcore/stream'
+    reports = []
+    try:
+        for users in args.users:
+            memory = MemorySampler(process.pid)
+            memory.start()
+            cache_before = read_cache_stats(stats_path)
+            start = time.perf_counter()
+            try:
+                results = asyncio.run(run_level(url, users, args, memory))
+            finally:
+                wall_seconds = time.perf_counter() - start
+                memory.stop()
+            # Let the server flush its latest counters
+            time.sleep(1.0)
+            cache = cache_report(cache_before, read_cache_stats(stats_path))
+            report = summarize(results, wall_seconds, memory, cache, users)
+            print_report(report)
+            reports.append(report)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(reports, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+# Columns of cars24_cleaned.csv shared by the model tools
+
+FEATURE_COLUMNS = [
+    'KM Driven', 'Fuel Type', 'Transmission Type', 'Ownership',
+    'Brand', 'Model_Only', 'Car Age'
+]
+TARGET_COLUMN = 'Price(in Lakhs)'